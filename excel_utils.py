@@ -7,8 +7,13 @@ with consistent formatting, suitable for SAP analysis and documentation tasks.
 Author: Created with Claude Code
 """
 
+import io
+import os
+import functools
+import tempfile
 import openpyxl
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.utils import column_index_from_string
 from datetime import datetime
 from typing import List, Dict, Tuple
 
@@ -34,7 +39,7 @@ class ExcelReportBuilder:
         """Add formatted title to the worksheet"""
         self.ws.merge_cells(merge_range)
         self.ws['A1'] = self.title
-        self.ws['A1'].font = Font(name='Calibri', size=14, bold=True, color='1F4E79')
+        self.ws['A1'].font = create_font(size=14, bold=True, color='1F4E79')
         self._current_row = 2
 
     def add_subtitle(self, merge_range: str = 'A2:I2'):
@@ -42,7 +47,7 @@ class ExcelReportBuilder:
         if self.subtitle:
             self.ws.merge_cells(merge_range)
             self.ws['A2'] = self.subtitle
-            self.ws['A2'].font = Font(name='Calibri', size=10, italic=True, color='666666')
+            self.ws['A2'].font = create_font(size=10, italic=True, color='666666')
             self._current_row = 3
 
     def add_headers(self, headers: List[Tuple[str, str, int]], row: int = 4):
@@ -53,18 +58,13 @@ class ExcelReportBuilder:
             headers: List of tuples (column_letter, header_text, width)
             row: Row number for headers (default: 4)
         """
-        header_font = Font(name='Calibri', size=11, bold=True, color='FFFFFF')
-        header_fill = PatternFill(start_color='1F4E79', end_color='1F4E79', fill_type='solid')
-        header_align = Alignment(wrap_text=True, vertical='center', horizontal='center')
-        thin_border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
+        header_font = create_font(size=11, bold=True, color='FFFFFF')
+        header_fill = create_fill('1F4E79')
+        header_align = create_alignment(wrap_text=True, vertical='center', horizontal='center')
+        thin_border = create_border('thin')
 
         for col_letter, header_text, width in headers:
-            cell = self.ws[f'{col_letter}{row}']
+            cell = self.ws.cell(row=row, column=column_index_from_string(col_letter))
             cell.value = header_text
             cell.font = header_font
             cell.fill = header_fill
@@ -85,26 +85,47 @@ class ExcelReportBuilder:
             start_row: Starting row number for data
             apply_borders: Whether to apply borders to cells
         """
-        wrap_align = Alignment(wrap_text=True, vertical='top')
-        thin_border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-
-        for idx, row_data in enumerate(data):
-            row = start_row + idx
-            for col_letter, data_key in column_mapping.items():
-                cell = self.ws[f'{col_letter}{row}']
-                cell.value = row_data.get(data_key, '')
+        wrap_align = create_alignment(wrap_text=True, vertical='top')
+        body_font = create_font(size=10)
+        thin_border = create_border('thin')
+
+        # Resolve column letters once instead of parsing a coordinate per cell
+        columns = sorted((column_index_from_string(col_letter), data_key)
+                         for col_letter, data_key in column_mapping.items())
+        next_free_row = self._current_row
+        self._current_row = start_row + len(data)
+        if not data or not columns:
+            return
+
+        # Data keys by position across the mapped column span (None = gap)
+        first_col, last_col = columns[0][0], columns[-1][0]
+        keys = [None] * (last_col - first_col + 1)
+        for col_idx, data_key in columns:
+            keys[col_idx - first_col] = data_key
+
+        # Values first: whole rows via ws.append when the block starts at the
+        # next free row, otherwise cell by cell at the requested position
+        if start_row == self.ws.max_row + 1 == next_free_row:
+            lead = [None] * (first_col - 1)
+            for row_data in data:
+                self.ws.append(lead + [None if k is None else row_data.get(k, '') for k in keys])
+        else:
+            for idx, row_data in enumerate(data):
+                for col_idx, data_key in columns:
+                    self.ws.cell(row=start_row + idx, column=col_idx,
+                                 value=row_data.get(data_key, ''))
+
+        # Then style the written block in one sweep
+        for row_cells in self.ws.iter_rows(min_row=start_row, max_row=self._current_row - 1,
+                                           min_col=first_col, max_col=last_col):
+            for cell, key in zip(row_cells, keys):
+                if key is None:
+                    continue
                 cell.alignment = wrap_align
-                cell.font = Font(name='Calibri', size=10)
+                cell.font = body_font
                 if apply_borders:
                     cell.border = thin_border
 
-        self._current_row = start_row + len(data)
-
     def apply_conditional_formatting(self, cell_ref: str, value: str,
                                     color_map: Dict[str, Tuple[str, str]]):
         """
@@ -116,15 +137,24 @@ class ExcelReportBuilder:
             color_map: Dict mapping values to (bg_color, font_color) tuples
         """
         if value in color_map:
-            bg_color, font_color = color_map[value]
             cell = self.ws[cell_ref]
-            cell.fill = PatternFill(start_color=bg_color, end_color=bg_color, fill_type='solid')
-            cell.font = Font(name='Calibri', size=10, bold=True, color=font_color)
+            cell.fill, cell.font = _severity_style(*color_map[value])
 
     def set_row_height(self, row: int, height: int):
         """Set the height of a specific row"""
         self.ws.row_dimensions[row].height = height
 
+    def set_default_row_height(self, height: int):
+        """
+        Set the height of all rows without an explicit height
+
+        Unlike set_row_height per row, this stores no per-row dimension
+        objects, so it stays cheap for large data bands. Rows that should
+        differ (titles, headers) still need set_row_height.
+        """
+        self.ws.sheet_format.defaultRowHeight = height
+        self.ws.sheet_format.customHeight = True
+
     def freeze_panes(self, cell: str):
         """Freeze panes at the specified cell"""
         self.ws.freeze_panes = cell
@@ -139,8 +169,7 @@ class ExcelReportBuilder:
 
     def save(self, filepath: str):
         """Save the workbook to the specified path"""
-        self.wb.save(filepath)
-        return filepath
+        return save_workbook(self.wb, filepath)
 
 
 class SeverityColorScheme:
@@ -152,14 +181,21 @@ class SeverityColorScheme:
         'LOW': ('C6EFCE', '006100'),       # Green background, dark green text
     }
 
+    @classmethod
+    def get_styles(cls) -> Dict[str, Tuple[PatternFill, Font]]:
+        """Get (PatternFill, Font) pairs for each severity level"""
+        return {level: _severity_style(bg_color, font_color)
+                for level, (bg_color, font_color) in cls.STANDARD.items()}
+
     @classmethod
     def get_fills(cls):
         """Get PatternFill objects for each severity level"""
-        return {
-            'HIGH': PatternFill(start_color='FFC7CE', end_color='FFC7CE', fill_type='solid'),
-            'MEDIUM': PatternFill(start_color='FFEB9C', end_color='FFEB9C', fill_type='solid'),
-            'LOW': PatternFill(start_color='C6EFCE', end_color='C6EFCE', fill_type='solid'),
-        }
+        return {level: fill for level, (fill, font) in cls.get_styles().items()}
+
+
+def _severity_style(bg_color: str, font_color: str) -> Tuple[PatternFill, Font]:
+    """Build the fill and bold font used to highlight a severity cell"""
+    return create_fill(bg_color), create_font(size=10, bold=True, color=font_color)
 
 
 def generate_timestamp() -> str:
@@ -167,6 +203,11 @@ def generate_timestamp() -> str:
     return datetime.now().strftime("%Y-%m-%d %H:%M")
 
 
+# Style factories are cached: openpyxl styles compare by value, so one
+# shared instance per spec can be assigned to any number of cells.
+# Treat the returned objects as read-only.
+
+@functools.lru_cache(maxsize=None)
 def create_border(style: str = 'thin') -> Border:
     """Create a border with the specified style"""
     return Border(
@@ -175,3 +216,55 @@ def create_border(style: str = 'thin') -> Border:
         top=Side(style=style),
         bottom=Side(style=style)
     )
+
+
+@functools.lru_cache(maxsize=None)
+def create_font(size: float = 10, bold: bool = False, italic: bool = False,
+                color: str = None, name: str = 'Calibri') -> Font:
+    """Create a font with the specified attributes"""
+    return Font(name=name, size=size, bold=bold, italic=italic, color=color)
+
+
+@functools.lru_cache(maxsize=None)
+def create_alignment(**kwargs) -> Alignment:
+    """Create an alignment from openpyxl Alignment keyword arguments"""
+    return Alignment(**kwargs)
+
+
+@functools.lru_cache(maxsize=None)
+def create_fill(color: str) -> PatternFill:
+    """Create a solid fill with the specified color"""
+    return PatternFill(start_color=color, end_color=color, fill_type='solid')
+
+
+def save_workbook(wb: openpyxl.Workbook, filepath: str,
+                  buffer_size: int = 1 << 20) -> str:
+    """
+    Save a workbook to disk with a single buffered write
+
+    openpyxl emits the xlsx zip as many small writes; serializing into
+    memory first turns them into one large sequential write. The file is
+    written under a temporary name next to the target and renamed into
+    place, so an interrupted run never leaves a truncated report behind.
+
+    Args:
+        wb: Workbook to save (normal or write-only)
+        filepath: Destination path
+        buffer_size: File buffer size in bytes (default: 1 MiB)
+    """
+    buf = io.BytesIO()
+    wb.save(buf)
+    directory = os.path.dirname(os.path.abspath(filepath))
+    fd, tmp_path = tempfile.mkstemp(suffix='.xlsx.tmp', dir=directory)
+    try:
+        with open(fd, 'wb', buffering=max(buffer_size, io.DEFAULT_BUFFER_SIZE)) as f:
+            f.write(buf.getbuffer())
+        # mkstemp creates owner-only files; apply the usual umask-based mode
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return filepath
@@ -13,6 +13,7 @@ API reference used:  SAP GUI Scripting API 6.40+
 
 Requirements:
     pip install pywin32
+    pip install pyrfc      (optional, only for run_se16h_via_rfc)
 
 Typical usage:
     from sap_scripting import SapSession
@@ -23,10 +24,18 @@ Typical usage:
         ...
 """
 
+import pythoncom
+import pywintypes
 import win32com.client
+import json
+import re
 import time
 import logging
-from typing import Optional, List, Dict, Any, Tuple
+import queue
+import traceback
+from collections import OrderedDict, deque
+from typing import Optional, List, Dict, Any, Tuple, Union, Iterator, Callable, Set
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 
 # ---------------------------------------------------------------------------
@@ -39,6 +48,24 @@ logging.basicConfig(
 )
 log = logging.getLogger("sap_scripting")
 
+# Absolute id prefix of a session: "/app/con[0]/ses[0]/"
+_SESSION_PREFIX = re.compile(r"^/app/con\[\d+\]/ses\[\d+\]/")
+
+# Table control cell id: ".../tblTABLE/<prefix><FIELD>[col,row]"
+_TABLE_CELL = re.compile(r"^(.*/tbl[^/]+)/[^/]+\[(\d+),(\d+)\]$")
+
+# Component type -> ContainerType, so explore_screen probes each type once.
+# Seeded with common types; others are learned on first sight.
+_CONTAINER_TYPES: Dict[str, bool] = {
+    "GuiMainWindow": True, "GuiModalWindow": True, "GuiUserArea": True,
+    "GuiSimpleContainer": True, "GuiScrollContainer": True,
+    "GuiCustomControl": True, "GuiContainerShell": True, "GuiShell": True,
+    "GuiTabStrip": True, "GuiTab": True,
+    "GuiTextField": False, "GuiCTextField": False, "GuiPasswordField": False,
+    "GuiLabel": False, "GuiButton": False, "GuiCheckBox": False,
+    "GuiRadioButton": False, "GuiComboBox": False, "GuiBox": False,
+}
+
 
 # ===========================================================================
 #  CORE:  GuiApplication / GuiConnection / GuiSession wrapper
@@ -73,12 +100,35 @@ class SapSession:
     VKEY_SHIFT_F4 = 16  # Save As
     VKEY_CTRL_SHIFT_F12 = 36
 
+    # Max. element handles kept by find_by_id between screen changes
+    ELEMENT_CACHE_SIZE = 256
+    # Sessions per logon allowed by default (rdisp/max_alt_modes)
+    MAX_SESSIONS = 6
+
     def __init__(self, connection_index: int = 0, session_index: int = 0):
         self.connection_index = connection_index
         self.session_index = session_index
         self.application = None  # GuiApplication
         self.connection = None   # GuiConnection
         self.session = None      # GuiSession
+        self.system_name = ""    # GuiSessionInfo.SystemName
+        # explore_screen results: container_id -> (screen_key, elements)
+        self._screen_cache: Dict[str, Tuple[tuple, List[Dict]]] = {}
+        # Resolved field ids: (system, program, screen, name, type prefixes)
+        # -> id; see save_field_map / load_field_map
+        self._field_ids: Dict[tuple, str] = {}
+        # Names a set_fields walk did not find on the current screen state:
+        # (program, screen, round trips, container_id, name)
+        self._field_misses: Set[tuple] = set()
+        # find_grid hits: (transaction, program, screen, search_id) -> id
+        self._grid_ids: Dict[tuple, str] = {}
+        # find_by_id results on the current screen: id -> COM object (LRU)
+        self._elements: "OrderedDict[str, Any]" = OrderedDict()
+        # Last screen_delta snapshot: container_id -> {id: (type, text)}
+        self._screen_snapshots: Dict[str, Dict[str, Tuple[str, str]]] = {}
+        self._lock_depth = 0
+        # Upper bound for fork; lowered when the server refuses a session
+        self.max_sessions = self.MAX_SESSIONS
         self._connect()
 
     # -- Context manager support --
@@ -107,8 +157,9 @@ class SapSession:
             self.connection = self.application.Children(self.connection_index)
             self.session = self.connection.Children(self.session_index)
             info = self.session.Info
+            self.system_name = info.SystemName
             log.info(
-                f"Connected: system={info.SystemName}, "
+                f"Connected: system={self.system_name}, "
                 f"client={info.Client}, user={info.User}, "
                 f"transaction={info.Transaction}"
             )
@@ -120,6 +171,104 @@ class SapSession:
                 "  • Is sapgui/user_scripting = TRUE on the server?"
             )
 
+    def fork(self, n: int, timeout: float = 10.0) -> List["SapSession"]:
+        """
+        Make sure n sessions are open on this connection and return them.
+
+        Uses: GuiSession.CreateSession()  (asynchronous: the new session
+              shows up in GuiConnection.Children a moment later)
+
+        The first entry is this session, the others are n - 1 sessions
+        created by this call.  Other sessions already open on the
+        connection are never returned — the user may be working in them.
+        The returned objects belong to the calling thread — for worker
+        threads pass their session_index to run_parallel (or reconnect
+        inside com_thread()).
+
+        The number of sessions per logon is limited by the server
+        (rdisp/max_alt_modes, usually 6) and may be by license.  No more
+        sessions are created than self.max_sessions leaves room for next
+        to the ones already open; if the server still refuses a new
+        session, max_sessions is lowered to what is open and fewer than
+        n sessions are returned instead of failing.  If the new sessions
+        do not show up within timeout (a slow GUI, not a limit),
+        TimeoutError is raised and max_sessions is left alone.
+        """
+        return [self if index == self.session_index
+                else SapSession(self.connection_index, index)
+                for index in self._open_sessions(n, timeout)]
+
+    def _open_sessions(self, n: int, timeout: float = 10.0,
+                       partial: bool = False) -> List[int]:
+        """
+        fork() without connecting: this session's index followed by the
+        indexes of the sessions created for it.  With partial=True, the
+        new sessions that showed up by the timeout are returned instead
+        of raising TimeoutError.
+        """
+        if n < 1:
+            return []
+        before = set(self._session_ids())
+        room = max(0, self.max_sessions - len(before))
+        if n - 1 > room:
+            log.warning(f"Limiting to {self.max_sessions} SAP sessions "
+                        f"({len(before)} open)")
+            n = room + 1
+        created = 0
+        for _ in range(n - 1):
+            try:
+                self.session.CreateSession()
+            except pywintypes.com_error as e:
+                self.max_sessions = len(before) + created
+                log.warning(f"SAP refused a new session ({e}); "
+                            f"limiting to {self.max_sessions} sessions")
+                break
+            created += 1
+        deadline = time.monotonic() + timeout
+        while True:
+            ids = self._session_ids()
+            new = [i for i, session_id in enumerate(ids)
+                   if session_id not in before]
+            if len(new) >= created:
+                break
+            if time.monotonic() > deadline:
+                message = f"Only {len(new)} of {created} new SAP sessions opened"
+                if partial:
+                    log.warning(f"{message}; going on without the rest")
+                    break
+                raise TimeoutError(message)
+            time.sleep(0.2)
+        return [self.session_index] + new[:created]
+
+    def _session_ids(self) -> List[str]:
+        """GuiSession.Id of every session on this connection, by index."""
+        children = self.connection.Children
+        return [children(i).Id for i in range(children.Count)]
+
+    def invalidate_cache(self, elements: bool = True):
+        """
+        Drop cached screen data.
+
+        Called by every helper that can change the screen or its field
+        values; call it yourself after driving self.session directly.
+        elements=False keeps the element handles of find_by_id, for
+        changes that only touch field values (no round trip to SAP).
+        """
+        self._screen_cache.clear()
+        if elements:
+            self._elements.clear()
+            self._field_misses.clear()
+
+    def _screen_key(self) -> tuple:
+        """
+        Identify the current screen state with a single Info read.
+
+        Uses: GuiSessionInfo.Program, .ScreenNumber, .RoundTrips
+              RoundTrips changes on every server round trip.
+        """
+        info = self.session.Info
+        return (info.Program, info.ScreenNumber, info.RoundTrips)
+
     def get_session_info(self) -> Dict[str, str]:
         """
         Read GuiSessionInfo properties.
@@ -152,6 +301,7 @@ class SapSession:
               Equivalent to SendCommand("/n<tcode>")
         """
         log.info(f"Starting transaction: {tcode}")
+        self.invalidate_cache()
         self.session.StartTransaction(tcode)
 
     def end_transaction(self):
@@ -161,6 +311,7 @@ class SapSession:
         Uses: GuiSession.EndTransaction()
               Equivalent to SendCommand("/n")
         """
+        self.invalidate_cache()
         self.session.EndTransaction()
 
     def send_command(self, command: str):
@@ -171,6 +322,7 @@ class SapSession:
         Examples: "/nSE16", "/nend", "/nex", "/o" (new session)
         """
         log.info(f"SendCommand: {command}")
+        self.invalidate_cache()
         self.session.SendCommand(command)
 
     def send_vkey(self, vkey: int, window_id: str = "wnd[0]"):
@@ -180,13 +332,17 @@ class SapSession:
         Uses: GuiFrameWindow.sendVKey(vkey)
         Common keys: 0=Enter, 2=F2, 3=Back, 8=F8/Execute, 12=Cancel
         """
-        self.session.findById(window_id).sendVKey(vkey)
+        def send(window):
+            self.invalidate_cache()
+            window.sendVKey(vkey)
+        self._with_element(window_id, send)
 
     # ------------------------------------------------------------------
     #  Element access  (findById, findByName, findAllByName, Children)
     # ------------------------------------------------------------------
 
-    def find_by_id(self, element_id: str, raise_error: bool = True):
+    def find_by_id(self, element_id: str, raise_error: bool = True,
+                   cached: bool = True):
         """
         Locate a UI element by its full scripting ID.
 
@@ -194,13 +350,62 @@ class SapSession:
               The id is a URL-like path: "wnd[0]/usr/ctxtFIELD_NAME"
 
         Returns the COM object, or None if raise_error=False and not found.
-        """
+        Handles are cached until the next screen change (see
+        invalidate_cache), so repeated lookups of one id are free.  A
+        cached handle is not checked: if the screen may have changed
+        behind this object's back, pass cached=False to look the id up
+        again (and refresh the cache), or use it via _with_element.
+        """
+        elements = self._elements
+        element = elements.get(element_id) if cached else None
+        if element is not None:
+            elements.move_to_end(element_id)
+            return element
         try:
-            return self.session.findById(element_id)
-        except Exception:
+            element = self.session.findById(element_id)
+        except pywintypes.com_error:
             if raise_error:
                 raise
             return None
+        elements[element_id] = element
+        elements.move_to_end(element_id)
+        if len(elements) > self.ELEMENT_CACHE_SIZE:
+            elements.popitem(last=False)
+        return element
+
+    def _with_element(self, element_id: str, action):
+        """
+        Run action(element) on the find_by_id handle of element_id.
+
+        A cached handle goes stale when the screen changes without this
+        object noticing (the user, another SapSession, self.session used
+        directly).  A cached handle is therefore checked with a cheap .Id
+        read first; if that fails, all cached handles are dropped and the
+        id is looked up again.  The action itself runs exactly once, so a
+        key or button is never sent twice.
+        """
+        if element_id in self._elements:
+            element = self.find_by_id(element_id)
+            try:
+                element.Id
+            except pywintypes.com_error:
+                self._elements.clear()
+                element = self.find_by_id(element_id, cached=False)
+        else:
+            element = self.find_by_id(element_id)
+        return action(element)
+
+    def find_many(self, element_ids: List[str]) -> Dict[str, Any]:
+        """
+        Locate several UI elements by full scripting ID in one call.
+
+        Uses: GuiSession.findById(id), once per distinct id
+
+        Returns {id: COM object}, with None for ids that do not exist.
+        """
+        return {element_id: self.find_by_id(element_id, raise_error=False,
+                                                 cached=False)
+                for element_id in dict.fromkeys(element_ids)}
 
     def find_by_name(self, name: str, component_type: str = ""):
         """
@@ -232,7 +437,7 @@ class SapSession:
         Uses: GuiVContainer.Children  (GuiComponentCollection)
         Default scans the user area of the main window.
         """
-        container = self.session.findById(element_id)
+        container = self.find_by_id(element_id, cached=False)
         children = container.Children
         return [children(i) for i in range(children.Count)]
 
@@ -251,25 +456,194 @@ class SapSession:
             element = self.session.findByName(field_name, field_type)
         else:
             # Try common field types
-            for ftype in ["ctxt", "txt", "cmb"]:
-                try:
-                    element = self.session.findByName(field_name, ftype)
-                    break
-                except Exception:
-                    continue
-            else:
+            element = self._resolve_field(field_name, self.FIELD_KINDS["text"])
+            if element is None:
                 raise ValueError(f"Field '{field_name}' not found as ctxt/txt/cmb")
 
+        self.invalidate_cache(elements=False)
         element.text = value
         log.debug(f"Set field {field_name} = '{value}'")
 
+    # Type prefixes per settable property, in lookup order
+    FIELD_KINDS = {"text": ("ctxt", "txt", "cmb"), "selected": ("chk", "rad")}
+    # Input field types tried by set_fields, in set_field's prefix order
+    INPUT_TYPES = ("GuiCTextField", "GuiTextField", "GuiComboBox")
+
+    def set_fields(self, values: Dict[str, str],
+                   container_id: str = "wnd[0]/usr") -> List[str]:
+        """
+        Set several fields by SAP data dictionary name in one pass.
+
+        Uses: one walk of the container's Children tree (.Type, and .Name
+              for input fields only), then .text = value per field
+
+        Replaces a findByName per field and type prefix (each miss a COM
+        exception) with a single enumeration.  The first field of a name
+        wins, preferring ctxt over txt over cmb like set_field.  Table
+        controls are not searched; their cells are not selection fields.
+        Field ids are remembered per dynpro (shared with set_field), and
+        names not found until the next screen change, so the walk is
+        skipped when all names are known already.
+
+        Returns the names that were not found on the screen or could not
+        be set (e.g. not input-ready); the other fields are still set.
+        """
+        info = self.session.Info
+        screen = (self.system_name, info.Program, info.ScreenNumber)
+        field_types = self.FIELD_KINDS["text"]
+
+        elements: Dict[str, Any] = {}
+        for name in values:
+            key = screen + (name, field_types)
+            element_id = self._field_ids.get(key)
+            if element_id is not None:
+                element = self.find_by_id(element_id, raise_error=False,
+                                          cached=False)
+                if element is None:
+                    del self._field_ids[key]
+                else:
+                    elements[name] = element
+
+        # Fields come and go on one dynpro (radio buttons, dynamic
+        # selections), so misses only hold for this screen state
+        misses = self._field_misses
+        state = (info.Program, info.ScreenNumber, info.RoundTrips,
+                 container_id)
+        unknown = [name for name in values if name not in elements
+                   and state + (name,) not in misses]
+        if unknown:
+            found: Dict[str, Tuple[int, Any]] = {}
+            pending = deque()
+            container = self.find_by_id(container_id, cached=False)
+            self._queue_children(pending, container, 0)
+            while pending:
+                element, _ = pending.popleft()
+                etype = element.Type
+                if etype in self.INPUT_TYPES:
+                    name = element.Name
+                    if name in values and name not in elements:
+                        rank = self.INPUT_TYPES.index(etype)
+                        if name not in found or rank < found[name][0]:
+                            found[name] = (rank, element)
+                elif (etype != "GuiTableControl"
+                      and _is_container(element, etype)):
+                    self._queue_children(pending, element, 0)
+            for name, (_, element) in found.items():
+                self._field_ids[screen + (name, field_types)] = \
+                    _SESSION_PREFIX.sub("", element.Id)
+                elements[name] = element
+            misses.update(state + (name,) for name in unknown
+                          if name not in found)
+
+        self.invalidate_cache(elements=False)
+        failed = []
+        for name, value in values.items():
+            if name not in elements:
+                failed.append(name)
+                continue
+            try:
+                elements[name].text = value
+            except pywintypes.com_error as e:
+                log.debug(f"Cannot set field {name}: {e}")
+                failed.append(name)
+            else:
+                log.debug(f"Set field {name} = '{value}'")
+        return failed
+
+    def save_field_map(self, path: str):
+        """
+        Write the resolved field ids (see set_field / set_fields) to a
+        JSON file, so a later run can skip field discovery.  Ids are
+        stored session-relative ("wnd[0]/usr/..."), valid in any session.
+        """
+        entries = [{"key": list(key), "id": element_id}
+                   for key, element_id in self._field_ids.items()]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(entries, f)
+
+    def load_field_map(self, path: str) -> int:
+        """
+        Merge field ids saved by save_field_map into this session.
+
+        Entries are keyed by system, program and screen number, so a map
+        shared between systems only applies where it was recorded; a
+        stale id is dropped the first time it fails to resolve.
+        Returns the number of entries loaded (0 if the file is missing).
+        """
+        try:
+            with open(path, encoding="utf-8") as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return 0
+        for entry in entries:
+            system, program, screen, name, field_types = entry["key"]
+            key = (system, program, screen, name, tuple(field_types))
+            self._field_ids[key] = entry["id"]
+        return len(entries)
+
+    def _resolve_field(self, field_name: str, field_types: Tuple[str, ...]):
+        """
+        Find a field by name, trying each type prefix in order.
+
+        Uses: GuiSession.findByName(name, type), then findById(id)
+              The winning element id is cached per (system, program,
+              screen), so repeat lookups on the same dynpro skip the
+              failed findByName attempts (each one a COM exception).
+
+        Returns the element, or None if no type prefix matches.
+        """
+        info = self.session.Info
+        key = (self.system_name, info.Program, info.ScreenNumber,
+               field_name, field_types)
+        element_id = self._field_ids.get(key)
+        if element_id is not None:
+            element = self.find_by_id(element_id, raise_error=False,
+                                      cached=False)
+            if element is not None:
+                return element
+            del self._field_ids[key]
+
+        for ftype in field_types:
+            try:
+                element = self.session.findByName(field_name, ftype)
+            except pywintypes.com_error:
+                continue
+            self._field_ids[key] = _SESSION_PREFIX.sub("", element.Id)
+            return element
+        return None
+
+    def set_field_typed(self, field_name: str, value: Any, kind: str = "text"):
+        """
+        Set a field by name when its kind is known up front.
+
+        Uses: .text = value  (kind "text": ctxt/txt/cmb)
+              .selected = value  (kind "selected": chk/rad)
+
+        Only the type prefixes of that kind are tried, and the winning id
+        is kept in the per-dynpro field map (shared with set_field), so a
+        warm call is one findById and one property write, with no COM
+        exceptions.  Raises ValueError if the field does not exist.
+        """
+        field_types = self.FIELD_KINDS.get(kind)
+        if field_types is None:
+            raise ValueError(f"Unknown field kind '{kind}'")
+        element = self._resolve_field(field_name, field_types)
+        if element is None:
+            raise ValueError(
+                f"Field '{field_name}' not found as {'/'.join(field_types)}"
+            )
+        self.invalidate_cache(elements=False)
+        setattr(element, kind, value)
+        log.debug(f"Set field {field_name} = '{value}'")
+
     def set_field_by_id(self, element_id: str, value: str):
         """
         Set a field value by its full scripting ID.
 
         Uses: findById(id).text = value
         """
-        self.session.findById(element_id).text = value
+        self.invalidate_cache(elements=False)
+        self._with_element(element_id, lambda e: setattr(e, "text", value))
 
     def get_field(self, field_name: str, field_type: str = "") -> str:
         """
@@ -279,16 +653,14 @@ class SapSession:
         """
         if field_type:
             return self.session.findByName(field_name, field_type).text
-        for ftype in ["txt", "ctxt", "lbl"]:
-            try:
-                return self.session.findByName(field_name, ftype).text
-            except Exception:
-                continue
-        raise ValueError(f"Field '{field_name}' not found")
+        element = self._resolve_field(field_name, ("txt", "ctxt", "lbl"))
+        if element is None:
+            raise ValueError(f"Field '{field_name}' not found")
+        return element.text
 
     def get_field_by_id(self, element_id: str) -> str:
         """Read a field value by its full scripting ID."""
-        return self.session.findById(element_id).text
+        return self._with_element(element_id, lambda e: e.text)
 
     def set_checkbox(self, field_name: str, checked: bool = True):
         """
@@ -297,12 +669,55 @@ class SapSession:
         Uses: GuiCheckBox.selected = True/False
               Type prefix: chk
         """
+        self.invalidate_cache(elements=False)
         cb = self.session.findByName(field_name, "chk")
         cb.selected = checked
 
     def set_checkbox_by_id(self, element_id: str, checked: bool = True):
         """Set a checkbox state by full ID."""
-        self.session.findById(element_id).selected = checked
+        self.invalidate_cache(elements=False)
+        self._with_element(element_id, lambda e: setattr(e, "selected", checked))
+
+    def batch_set(self, items: List[Tuple[str, Any, str]]):
+        """
+        Set many field values by full scripting ID in one pass.
+
+        Uses: GuiVContainer.findById(relative id) on each parent container,
+              then .text = value  (kind "text")
+                   .selected = value  (kind "selected")
+
+        items are (element_id, value, kind) tuples, applied in order.
+        Each distinct parent is resolved once per batch and its children
+        are looked up relative to it instead of walking the full id path
+        from the session for every cell.  Table control cells are indexed
+        directly on the table with GuiTableControl.GetCell(row, col).
+        """
+        for _, _, kind in items:
+            if kind not in ("text", "selected"):
+                raise ValueError(f"Unknown batch_set kind '{kind}'")
+
+        self.invalidate_cache(elements=False)
+        parents: Dict[str, Any] = {}
+
+        def parent_of(parent_id):
+            parent = parents.get(parent_id)
+            if parent is None:
+                parent = parents[parent_id] = self.find_by_id(parent_id,
+                                                              cached=False)
+            return parent
+
+        for element_id, value, kind in items:
+            cell = _TABLE_CELL.match(element_id)
+            if cell:
+                table_id, col, row = cell.groups()
+                element = parent_of(table_id).GetCell(int(row), int(col))
+            else:
+                parent_id, _, child_id = element_id.rpartition("/")
+                if not parent_id:
+                    element = self.find_by_id(element_id, cached=False)
+                else:
+                    element = parent_of(parent_id).findById(child_id)
+            setattr(element, kind, value)
 
     def select_radio(self, field_name: str):
         """
@@ -311,6 +726,7 @@ class SapSession:
         Uses: GuiRadioButton.select()
               Type prefix: rad
         """
+        self.invalidate_cache()
         self.session.findByName(field_name, "rad").select()
 
     def press_button(self, field_name: str = "", element_id: str = ""):
@@ -320,10 +736,14 @@ class SapSession:
         Uses: GuiButton.press()
               Type prefix: btn
         """
+        def press(button):
+            self.invalidate_cache()
+            button.press()
+
         if element_id:
-            self.session.findById(element_id).press()
+            self._with_element(element_id, press)
         elif field_name:
-            self.session.findByName(field_name, "btn").press()
+            press(self.session.findByName(field_name, "btn"))
 
     def select_tab(self, tab_id: str):
         """
@@ -332,7 +752,10 @@ class SapSession:
         Uses: GuiTab.select()
               Type prefix: tabp
         """
-        self.session.findById(tab_id).select()
+        def select(tab):
+            self.invalidate_cache()
+            tab.select()
+        self._with_element(tab_id, select)
 
     def select_combo_entry(self, field_name: str, key: str):
         """
@@ -341,6 +764,7 @@ class SapSession:
         Uses: GuiComboBox.key = value
               GuiComboBox.Entries contains GuiComboBoxEntry items
         """
+        self.invalidate_cache()
         combo = self.session.findByName(field_name, "cmb")
         combo.key = key
 
@@ -362,11 +786,16 @@ class SapSession:
         }
 
     def check_statusbar_error(self) -> Optional[str]:
-        """Returns error message text if statusbar shows an error, else None."""
-        sb = self.get_statusbar()
-        if sb["type"] in ("E", "A"):
-            return sb["text"]
-        return None
+        """
+        Returns error message text if statusbar shows an error, else None.
+
+        Reads MessageType first; the text is only fetched for errors.
+        """
+        def error_text(sbar):
+            if sbar.MessageType in ("E", "A"):
+                return sbar.Text
+            return None
+        return self._with_element("wnd[0]/sbar", error_text)
 
     # ------------------------------------------------------------------
     #  Modal window / pop-up handling  (GuiModalWindow)
@@ -378,16 +807,23 @@ class SapSession:
         Try to dismiss a modal popup window.
 
         Uses: GuiModalWindow (wnd[1]) — press a button on it.
+              GuiSession.ActiveWindow tells whether a popup is open without
+              the COM exception of looking up a missing wnd[1].
         Returns True if a popup was handled, False if none existed.
         """
         if check_exists:
-            popup = self.find_by_id("wnd[1]", raise_error=False)
-            if popup is None:
+            active_id = _SESSION_PREFIX.sub("", self.session.ActiveWindow.Id)
+            if active_id == "wnd[0]":
                 return False
+        def press(button):
+            self.invalidate_cache()
+            button.press()
+
         try:
-            self.session.findById(button_id).press()
+            self._with_element(button_id, press)
             return True
         except Exception:
+            self.invalidate_cache()
             return False
 
     # ------------------------------------------------------------------
@@ -398,11 +834,29 @@ class SapSession:
         """
         Search for a GuiGridView control within a container.
 
-        Uses: Children traversal, checking .type == "GuiGridView"
-              Falls back to common known grid paths.
+        Uses: common known grid paths first, then a Children traversal
+              for a GuiShell with SubType "GridView".
+              The id found is remembered per (transaction, program,
+              screen), so later calls on the same dynpro take one findById.
 
         Returns the grid COM object or None.
         """
+        info = self.session.Info
+        key = (info.Transaction, info.Program, info.ScreenNumber, search_id)
+        grid_id = self._grid_ids.get(key)
+        if grid_id is not None:
+            grid = self.find_by_id(grid_id, raise_error=False, cached=False)
+            if grid is not None:
+                return grid
+            del self._grid_ids[key]
+
+        grid = self._search_grid(search_id)
+        if grid is not None:
+            self._grid_ids[key] = _SESSION_PREFIX.sub("", grid.Id)
+        return grid
+
+    def _search_grid(self, search_id: str):
+        """Look for a grid at the usual paths, then anywhere below search_id."""
         # Try common grid container paths first
         common_paths = [
             f"{search_id}/cntlRESULT_LIST/shellcont/shell",
@@ -412,9 +866,22 @@ class SapSession:
             f"{search_id}/cntlALV_CONTAINER/shellcont/shell",
         ]
         for path in common_paths:
-            grid = self.find_by_id(path, raise_error=False)
+            grid = self.find_by_id(path, raise_error=False, cached=False)
             if grid is not None:
                 return grid
+
+        container = self.find_by_id(search_id, raise_error=False, cached=False)
+        if container is None:
+            return None
+        pending = deque()
+        self._queue_children(pending, container, 0)
+        while pending:
+            element, _ = pending.popleft()
+            etype = element.Type
+            if etype == "GuiShell" and element.SubType == "GridView":
+                return element
+            if _is_container(element, etype):
+                self._queue_children(pending, element, 0)
         return None
 
     def grid_get_row_count(self, grid) -> int:
@@ -465,55 +932,166 @@ class SapSession:
         """
         Read all data from a GuiGridView into a list of dicts.
 
-        Uses: RowCount, ColumnOrder, GetCellValue
+        Uses: RowCount, ColumnOrder, GetCellValue, FirstVisibleRow
 
         Args:
             grid:     The GuiGridView COM object
-            columns:  Specific columns to read (default: all)
+            columns:  Specific columns to read (default: all); columns
+                      the grid does not have come back as ""
             max_rows: Limit rows (0 = all)
         """
-        if columns is None:
-            columns = self.grid_get_columns(grid)
+        return list(self.grid_read_iter(grid, columns, max_rows))
+
+    def grid_read_iter(self, grid, columns: List[str] = None,
+                       max_rows: int = 0) -> Iterator[Dict[str, str]]:
+        """
+        Yield the rows of a GuiGridView as dicts, page by page.
+
+        Same arguments as grid_read_all.  Rows are read as the consumer
+        asks for them, so only one page is held in memory; the grid's
+        scroll position is restored when the generator is exhausted or
+        closed.  Do not drive the session in between.
+        """
+        columns, readable = self._grid_columns(grid, columns)
 
         total = grid.RowCount
         if max_rows > 0:
             total = min(total, max_rows)
 
-        data = []
-        for row in range(total):
-            record = {}
-            for col in columns:
-                try:
-                    record[col] = grid.GetCellValue(row, col)
-                except Exception:
-                    record[col] = ""
-            data.append(record)
+        # Resolve the COM method once instead of per cell
+        get_cell = grid.GetCellValue
+        for start, stop in self._grid_pages(grid, total):
+            for row in range(start, stop):
+                values = dict.fromkeys(columns, "")
+                for col in readable:
+                    try:
+                        values[col] = get_cell(row, col)
+                    except Exception:
+                        pass
+                yield values
 
         log.info(f"Grid read: {total} rows × {len(columns)} columns")
+
+    def grid_read_all_columnar(self, grid, columns: List[str] = None,
+                               max_rows: int = 0) -> Dict[str, List[str]]:
+        """
+        Read all data from a GuiGridView into one list per column.
+
+        Uses: RowCount, ColumnOrder, GetCellValue, FirstVisibleRow
+
+        Same arguments as grid_read_all, but returns {column: [values]}
+        instead of one dict per row: far fewer Python objects for large
+        grids, and ready to hand to pandas.DataFrame as-is.
+        """
+        columns, readable = self._grid_columns(grid, columns)
+
+        total = grid.RowCount
+        if max_rows > 0:
+            total = min(total, max_rows)
+
+        # Preallocated, filled column by column within each page
+        get_cell = grid.GetCellValue
+        data = {col: [""] * total for col in columns}
+        for start, stop in self._grid_pages(grid, total):
+            for col in readable:
+                values = data[col]
+                for row in range(start, stop):
+                    try:
+                        values[row] = get_cell(row, col)
+                    except Exception:
+                        pass
+
+        log.info(f"Grid read (columnar): {total} rows × {len(columns)} columns")
         return data
 
-    def grid_get_distinct(self, grid, column: str) -> List[str]:
+    def _grid_columns(self, grid, columns: Optional[List[str]]
+                      ) -> Tuple[List[str], List[str]]:
+        """
+        Return (columns, readable): the requested columns (all if None)
+        and those of them the grid actually has.
+
+        Columns the grid lacks (e.g. COUNT without grouping) are dropped
+        up front instead of raising a COM exception for every row.
+        """
+        available = self.grid_get_columns(grid)
+        if columns is None:
+            return available, available
+        present = set(available)
+        readable = [col for col in columns if col in present]
+        if len(readable) < len(columns):
+            log.debug(f"Grid has no column(s) "
+                      f"{[col for col in columns if col not in present]}")
+        return columns, readable
+
+    @staticmethod
+    def _grid_pages(grid, total: int):
+        """
+        Yield (start, stop) row ranges of one screen page each.
+
+        Uses: GuiGridView.VisibleRowCount, FirstVisibleRow
+
+        ALV grids fetch rows from the server as they are scrolled into
+        view, so reading far beyond the visible rows cell by cell is slow
+        or returns blanks.  Each page is scrolled into view once before it
+        is read; the original scroll position is restored afterwards.
+        """
+        page = grid.VisibleRowCount
+        if page <= 0 or total <= page:
+            yield 0, total
+            return
+        first_visible = grid.FirstVisibleRow
+        try:
+            for start in range(0, total, page):
+                grid.FirstVisibleRow = start
+                yield start, min(start + page, total)
+        finally:
+            grid.FirstVisibleRow = first_visible
+
+    def grid_get_distinct(self, grid, column: str,
+                          early_exit: bool = False) -> List[str]:
         """
         Get distinct values for a single column from a grid.
 
         Uses: RowCount, GetCellValue
+
+        Args:
+            grid:       The GuiGridView COM object
+            column:     Column ID to scan
+            early_exit: Stop once the set of values has stopped growing for
+                        three checkpoints of 256 rows (grids over 1000 rows
+                        only). Fast for low-cardinality columns (status,
+                        plant), but values that first appear late are missed.
         """
+        total = grid.RowCount
+        get_cell = grid.GetCellValue
+        check_every = 256
+        patience = 3 if early_exit and total > 1000 else 0
+
         values = set()
-        for row in range(grid.RowCount):
-            val = grid.GetCellValue(row, column).strip()
-            values.add(val)
+        last_size = 0
+        stale_checks = 0
+        for row in range(total):
+            values.add(get_cell(row, column).strip())
+            if patience and (row + 1) % check_every == 0:
+                stale_checks = stale_checks + 1 if len(values) == last_size else 0
+                last_size = len(values)
+                if stale_checks >= patience:
+                    log.info(f"Distinct {column}: converged after {row + 1} of {total} rows")
+                    break
         return sorted(values)
 
     def grid_click_cell(self, grid, row: int, column: str):
         """
         Uses: GuiGridView.Click(row, column)
         """
+        self.invalidate_cache()
         grid.Click(row, column)
 
     def grid_double_click_cell(self, grid, row: int, column: str):
         """
         Uses: GuiGridView.DoubleClick(row, column)
         """
+        self.invalidate_cache()
         grid.DoubleClick(row, column)
 
     def grid_select_rows(self, grid, rows: str):
@@ -575,60 +1153,163 @@ class SapSession:
         Useful for discovering field IDs and types on unknown screens.
 
         Uses: Children collection, .Id, .Type, .Name, .Text (where available)
+
+        Results are cached per screen state (program, screen number, round
+        trips) until a helper changes the screen or a field value.
         """
-        elements = []
         try:
-            container = self.session.findById(container_id)
-            children = container.Children
-            for i in range(children.Count):
-                child = children(i)
-                info = {
-                    "id": child.Id,
-                    "type": child.Type,
-                    "name": child.Name,
-                }
-                try:
-                    info["text"] = child.Text
-                except Exception:
-                    info["text"] = ""
-                try:
-                    info["changeable"] = child.Changeable
-                except Exception:
-                    info["changeable"] = None
-
-                elements.append(info)
-
-                # Recurse one level for containers
-                try:
-                    if child.ContainerType:
-                        sub_children = child.Children
-                        for j in range(sub_children.Count):
-                            sc = sub_children(j)
-                            sub_info = {
-                                "id": sc.Id,
-                                "type": sc.Type,
-                                "name": sc.Name,
-                            }
-                            try:
-                                sub_info["text"] = sc.Text
-                            except Exception:
-                                sub_info["text"] = ""
-                            elements.append(sub_info)
-                except Exception:
-                    pass
+            key = self._screen_key()
+        except Exception:
+            key = None
+        cached = self._screen_cache.get(container_id)
+        if key is not None and cached is not None and cached[0] == key:
+            return [dict(e) for e in cached[1]]
 
+        elements = []
+        try:
+            container = self.find_by_id(container_id, cached=False)
+            # Recurse one level for containers
+            self._collect_children(container, elements, depth=1)
         except Exception as e:
             log.warning(f"explore_screen error: {e}")
+            return elements
 
+        if key is not None:
+            self._screen_cache[container_id] = (key, elements)
+            return [dict(e) for e in elements]
         return elements
 
+    # Layout-only containers; listed in compact dumps only when they carry text
+    LAYOUT_TYPES = ("GuiSimpleContainer", "GuiUserArea", "GuiContainerShell",
+                    "GuiCustomControl", "GuiScrollContainer")
+
+    def explore_screen_compact(self, container_id: str = "wnd[0]/usr",
+                               max_text: int = 80) -> str:
+        """
+        Compact JSON view of explore_screen, e.g. for pasting into a prompt.
+
+        Elements are stored as parallel arrays (ids, types, texts, depth)
+        instead of one object per element.  Ids are made session-relative
+        ("wnd[0]/usr/...", still valid for findById), texts are cut to
+        max_text characters, and text-less layout containers are dropped;
+        "elided" counts what was dropped.
+        """
+        view = self._compact_view(container_id, max_text)
+        return json.dumps(view, separators=(",", ":"), ensure_ascii=False)
+
+    def screen_delta(self, container_id: str = "wnd[0]/usr",
+                     max_text: int = 80) -> str:
+        """
+        Compact JSON of what changed on screen since the previous call.
+
+        The first call for a container returns the full explore_screen_compact
+        dump.  Later calls return only the differences to the last snapshot:
+            {"added": {id: [type, text]}, "removed": [id, ...],
+             "changed": {id: new_text}}
+        so a long multi-step flow sends O(changed elements) per step.
+        Use forget_screen() to force a full dump on the next call.
+        """
+        view = self._compact_view(container_id, max_text)
+        current = {element_id: (etype, text) for element_id, etype, text
+                   in zip(view["ids"], view["types"], view["texts"])}
+        previous = self._screen_snapshots.get(container_id)
+        self._screen_snapshots[container_id] = current
+        if previous is None:
+            delta = view
+        else:
+            delta = {
+                "added": {element_id: list(entry)
+                          for element_id, entry in current.items()
+                          if element_id not in previous},
+                "removed": [element_id for element_id in previous
+                            if element_id not in current],
+                "changed": {element_id: entry[1]
+                            for element_id, entry in current.items()
+                            if element_id in previous
+                            and previous[element_id][1] != entry[1]},
+            }
+        return json.dumps(delta, separators=(",", ":"), ensure_ascii=False)
+
+    def forget_screen(self, container_id: str = ""):
+        """Drop screen_delta snapshots (one container, or all if empty)."""
+        if container_id:
+            self._screen_snapshots.pop(container_id, None)
+        else:
+            self._screen_snapshots.clear()
+
+    def _compact_view(self, container_id: str, max_text: int) -> Dict[str, Any]:
+        """Parallel-array view of explore_screen used by the compact dumps."""
+        view = {"ids": [], "types": [], "texts": [], "depth": []}
+        base_depth = _SESSION_PREFIX.sub("", container_id).count("/") + 1
+        elided = 0
+        for element in self.explore_screen(container_id):
+            etype, text = element["type"], element["text"] or ""
+            if etype in self.LAYOUT_TYPES and not text:
+                elided += 1
+                continue
+            element_id = _SESSION_PREFIX.sub("", element["id"])
+            view["ids"].append(element_id)
+            view["types"].append(etype)
+            view["texts"].append(text[:max_text])
+            view["depth"].append(element_id.count("/") - base_depth)
+        view["count"] = len(view["ids"])
+        view["elided"] = elided
+        return view
+
+    def _collect_children(self, container, elements: List[Dict], depth: int):
+        """
+        Append the properties of a container's children to elements.
+
+        Reads the Children collection once per container and each property
+        once per element; descends depth more levels into sub-containers.
+        Iterative, in screen order (each container followed by its
+        children); whether a type is a container is looked up in
+        _CONTAINER_TYPES instead of probing ContainerType per element.
+        """
+        pending = deque()
+        self._queue_children(pending, container, depth)
+        while pending:
+            element, depth = pending.popleft()
+            info = self._describe_element(element, changeable=depth > 0)
+            elements.append(info)
+            if depth > 0 and _is_container(element, info["type"]):
+                self._queue_children(pending, element, depth - 1)
+
+    @staticmethod
+    def _queue_children(pending: deque, container, depth: int):
+        """Put a container's children at the front of pending, in order."""
+        children = container.Children
+        count = children.Count
+        if count:
+            pending.extendleft((children(i), depth)
+                               for i in range(count - 1, -1, -1))
+
+    @staticmethod
+    def _describe_element(element, changeable: bool = True) -> Dict:
+        """Read id, type, name, text (and optionally changeable) of an element."""
+        info = {
+            "id": element.Id,
+            "type": element.Type,
+            "name": element.Name,
+        }
+        try:
+            info["text"] = element.Text
+        except Exception:
+            info["text"] = ""
+        if changeable:
+            try:
+                info["changeable"] = element.Changeable
+            except Exception:
+                info["changeable"] = None
+        return info
+
     def visualize_element(self, element_id: str, on: bool = True):
         """
         Draw a red frame around a UI element (for debugging).
 
         Uses: GuiVComponent.Visualize(on)
         """
-        self.session.findById(element_id).Visualize(on)
+        self._with_element(element_id, lambda e: e.Visualize(on))
 
     # ------------------------------------------------------------------
     #  Session locking
@@ -652,12 +1333,182 @@ class SapSession:
 
     @contextmanager
     def locked(self):
-        """Context manager: locks UI during block, always unlocks after."""
-        self.lock_ui()
+        """
+        Context manager: locks UI during block, always unlocks after.
+
+        Blocks may nest; only the outermost one locks and unlocks.
+        """
+        if self._lock_depth == 0:
+            self.lock_ui()
+        self._lock_depth += 1
         try:
             yield
         finally:
-            self.unlock_ui()
+            self._lock_depth -= 1
+            if self._lock_depth == 0:
+                self.unlock_ui()
+
+
+def _is_container(element, element_type: str) -> bool:
+    """ContainerType of element, probed once per component type."""
+    is_container = _CONTAINER_TYPES.get(element_type)
+    if is_container is None:
+        try:
+            is_container = bool(element.ContainerType)
+        except Exception:
+            is_container = False
+        _CONTAINER_TYPES[element_type] = is_container
+    return is_container
+
+
+# ===========================================================================
+#  THREADING:  COM apartment per worker thread
+# ===========================================================================
+
+@contextmanager
+def com_thread():
+    """
+    Initialize COM for the calling worker thread.
+
+    Uses: pythoncom.CoInitialize / CoUninitialize
+
+    SAP GUI scripting objects live in a single-threaded apartment, so a
+    SapSession must be created and used on one thread.  A worker thread
+    opens this block and connects its own SapSession inside it:
+
+        with com_thread():
+            sap = SapSession(connection_index=0, session_index=1)
+            ...
+            del sap
+
+    All COM proxies must be released before the block ends; with a
+    SapSessionPool, use pool.run(job).
+    """
+    pythoncom.CoInitialize()
+    try:
+        yield
+    finally:
+        pythoncom.CoUninitialize()
+
+
+def run_parallel(sap: SapSession, jobs: List[Any]) -> List[Any]:
+    """
+    Run independent jobs at the same time, each on its own SAP session.
+
+    Uses: SapSessionPool, one worker thread per session with com_thread()
+
+    Each job is a callable taking a SapSession, e.g. two ALV reads:
+
+        bsik, bsak = run_parallel(sap, [
+            lambda s: run_se16h(s, "BSIK", fields),
+            lambda s: run_se16h(s, "BSAK", fields),
+        ])
+
+    Jobs must not share COM objects; each worker connects its own
+    SapSession to one of the forked sessions.  If fewer sessions can be
+    opened than there are jobs (see SapSession.max_sessions), jobs queue
+    for a free one.  Results come back in job order; the first exception
+    raised by a job is re-raised.
+    """
+    if not jobs:
+        return []
+    pool = SapSessionPool(sap, size=len(jobs))
+
+    try:
+        with ThreadPoolExecutor(max_workers=pool.size) as executor:
+            futures = [executor.submit(pool.run, job) for job in jobs]
+        return [future.result() for future in futures]
+    finally:
+        pool.finish()
+
+
+class SapSessionPool:
+    """
+    A fixed set of SAP sessions shared by worker threads.
+
+    Sessions are handed out by index; each worker connects its own
+    SapSession to the acquired index (see com_thread()).  The size is
+    bounded by sap.max_sessions, and if the server refuses more sessions
+    the pool keeps the ones that did open — down to just the caller's
+    session, which makes pooled work run serially.  Besides the caller's
+    session, only sessions the pool created itself are used (see
+    SapSession.fork), never other windows the user has open.
+
+    The caller's own session is part of the pool.  Workers navigate it
+    through their own SapSession, so the caller's cached screen data and
+    element handles go stale; call finish() on the caller's thread once
+    the pooled work is done.
+
+        pool = SapSessionPool(sap, size=4)
+        pool.run(lambda s: run_transaction_report(s, "FBL1N", ...))
+        pool.finish()
+    """
+
+    def __init__(self, sap: SapSession, size: int = 4):
+        self.connection_index = sap.connection_index
+        self._owner = sap
+        self._owner_used = False
+        indexes = sap._open_sessions(max(1, size), partial=True)
+        self.size = len(indexes)
+        self._free: "queue.Queue[int]" = queue.Queue()
+        for index in indexes:
+            self._free.put(index)
+
+    def acquire(self, timeout: Optional[float] = None) -> int:
+        """Take a free session index, waiting until one is released."""
+        return self._free.get(timeout=timeout)
+
+    def release(self, session_index: int):
+        """Return a session index taken with acquire()."""
+        if session_index == self._owner.session_index:
+            # The owner's caches hold COM objects of the caller's thread;
+            # they are dropped there, in finish()
+            self._owner_used = True
+        self._free.put(session_index)
+
+    def finish(self):
+        """
+        Drop the caller's cached screen data if a worker used its session.
+
+        Call from the thread that created the pool, after the workers are
+        done.
+        """
+        if self._owner_used:
+            self._owner_used = False
+            self._owner.invalidate_cache()
+
+    @contextmanager
+    def session(self):
+        """
+        Acquire a session and connect to it from the calling thread.
+
+        Must be used inside com_thread(), and the SapSession must be gone
+        before that block ends — prefer run(), which takes care of both.
+        """
+        session_index = self.acquire()
+        try:
+            yield SapSession(self.connection_index, session_index)
+        finally:
+            self.release(session_index)
+
+    def run(self, job: Callable[[SapSession], Any]) -> Any:
+        """
+        Call job(session) on a pooled session, from a worker thread.
+
+        COM is initialized for the call, and the SapSession with all its
+        COM proxies is released before COM is uninitialized again — also
+        when job raises (the traceback's frames are cleared).
+        """
+        def call():
+            with self.session() as session:
+                return job(session)
+
+        with com_thread():
+            try:
+                return call()
+            except BaseException as e:
+                traceback.clear_frames(e.__traceback__)
+                raise
 
 
 # ===========================================================================
@@ -666,7 +1517,10 @@ class SapSession:
 
 def run_se16h(sap: SapSession, table: str,
               fields: List[Dict[str, str]],
-              max_rows: int = 0) -> List[Dict[str, str]]:
+              max_rows: int = 0,
+              lock_ui: bool = False,
+              columnar: bool = False
+              ) -> Union[List[Dict[str, str]], Dict[str, List[str]]]:
     """
     Generic SE16H execution.
 
@@ -679,44 +1533,114 @@ def run_se16h(sap: SapSession, table: str,
                     "sum": True,            ← sum (optional)
                     "value": "A" }          ← selection value (optional)
         max_rows: Limit rows returned (0 = all)
+        lock_ui:  Lock the session UI for the whole run (see SapSession.locked)
+        columnar: Return {column: [values]} (see grid_read_all_columnar)
 
     Returns:
-        List of row dicts with field values.
+        List of row dicts with field values, or a dict of column lists
+        if columnar is set.
     """
-    sap.start_transaction("SE16H")
-    sap.set_field_by_id("wnd[0]/usr/ctxtGD-TAB", table)
-    sap.send_vkey(SapSession.VKEY_ENTER)
+    return compile_se16h(table, fields)(sap, max_rows,
+                                        lock_ui=lock_ui, columnar=columnar)
 
-    # Fill fields into the selection table
+
+def compile_se16h(table: str, fields: List[Dict[str, str]]
+                  ) -> Callable[..., Union[List[Dict[str, str]], Dict[str, List[str]]]]:
+    """
+    Prepare run_se16h for a fixed table and field config.
+
+    The field-table cell ids, selection values and result columns are
+    worked out once; the returned function
+        run(sap, max_rows=0, lock_ui=False, columnar=False)
+    only drives the GUI.  Use it when the same extract runs repeatedly,
+    e.g. in a polling loop:
+
+        read_bsik = compile_se16h("BSIK", fields)
+        rows = read_bsik(sap, max_rows=500)
+    """
+    items, values, read_cols = _se16h_plan(fields)
+
+    def run(sap: SapSession, max_rows: int = 0, lock_ui: bool = False,
+            columnar: bool = False):
+        if lock_ui:
+            with sap.locked():
+                return run(sap, max_rows, columnar=columnar)
+
+        grid = _se16h_execute(sap, table, items, values, max_rows)
+        if grid is None:
+            return {} if columnar else []
+        if columnar:
+            return sap.grid_read_all_columnar(grid, columns=read_cols, max_rows=max_rows)
+        return sap.grid_read_all(grid, columns=read_cols, max_rows=max_rows)
+
+    return run
+
+
+def run_se16h_iter(sap: SapSession, table: str,
+                   fields: List[Dict[str, str]],
+                   max_rows: int = 0) -> Iterator[Dict[str, str]]:
+    """
+    Streaming run_se16h: yields the result rows one by one.
+
+    Same arguments as run_se16h.  The transaction runs when iteration
+    starts; rows are read page by page (see grid_read_iter).  Wrap the
+    loop in sap.locked() to lock the UI.
+    """
+    items, values, read_cols = _se16h_plan(fields)
+    grid = _se16h_execute(sap, table, items, values, max_rows)
+    if grid is not None:
+        yield from sap.grid_read_iter(grid, read_cols, max_rows)
+
+
+def _se16h_plan(fields: List[Dict[str, str]]
+                ) -> Tuple[List[Tuple[str, Any, str]], Dict[str, str], List[str]]:
+    """
+    Turn a run_se16h field config into (fields-table writes for
+    batch_set, selection values, result columns).
+    """
+    fields_table = "wnd[0]/usr/tblSAPLSE16HFIELDS_TABLE"
+    items = []
     for idx, field_cfg in enumerate(fields):
-        fname = field_cfg["name"]
-        # Set field name in the fields table
-        sap.set_field_by_id(
-            f"wnd[0]/usr/tblSAPLSE16HFIELDS_TABLE/ctxtGS_FIELDS-FIELDNAME[0,{idx}]",
-            fname,
-        )
+        # Field name in the fields table
+        items.append((f"{fields_table}/ctxtGS_FIELDS-FIELDNAME[0,{idx}]",
+                      field_cfg["name"], "text"))
         # Group checkbox (column index 4 in SE16H fields table)
         if field_cfg.get("group"):
-            sap.set_checkbox_by_id(
-                f"wnd[0]/usr/tblSAPLSE16HFIELDS_TABLE/chkGS_FIELDS-AGGR[4,{idx}]",
-                True,
-            )
+            items.append((f"{fields_table}/chkGS_FIELDS-AGGR[4,{idx}]",
+                          True, "selected"))
         # Sum checkbox (column index 5 in SE16H fields table)
         if field_cfg.get("sum"):
-            sap.set_checkbox_by_id(
-                f"wnd[0]/usr/tblSAPLSE16HFIELDS_TABLE/chkGS_FIELDS-SUM[5,{idx}]",
-                True,
-            )
+            items.append((f"{fields_table}/chkGS_FIELDS-SUM[5,{idx}]",
+                          True, "selected"))
+
+    # Selection values (fields with a "value" key)
+    values = {f["name"]: f["value"] for f in fields if "value" in f}
 
+    # Columns to read; also COUNT if grouping was used
+    read_cols = [f["name"] for f in fields]
+    if any(f.get("group") for f in fields):
+        read_cols.append("COUNT")
+    return items, values, read_cols
+
+
+def _se16h_execute(sap: SapSession, table: str,
+                   items: List[Tuple[str, Any, str]],
+                   values: Dict[str, str], max_rows: int):
+    """Run SE16H up to the result list; returns the grid or None."""
+    sap.start_transaction("SE16H")
+    sap.set_field_by_id("wnd[0]/usr/ctxtGD-TAB", table)
     sap.send_vkey(SapSession.VKEY_ENTER)
 
-    # Set selection values (if any fields have a "value" key)
-    for field_cfg in fields:
-        if "value" in field_cfg:
-            try:
-                sap.set_field(field_cfg["name"], field_cfg["value"])
-            except Exception:
-                pass
+    # Fill fields into the selection table
+    sap.batch_set(items)
+
+    sap.send_vkey(SapSession.VKEY_ENTER)
+
+    # Set selection values
+    if values:
+        missing = sap.set_fields(values)
+        if missing:
+            log.debug(f"SE16H: no selection field for {missing}")
 
     # Set max rows if specified
     if max_rows > 0:
@@ -735,28 +1659,86 @@ def run_se16h(sap: SapSession, table: str,
     err = sap.check_statusbar_error()
     if err:
         log.warning(f"SE16H status: {err}")
-        return []
+        return None
 
-    # Read grid
+    # Result grid
     grid = sap.find_grid()
     if grid is None:
         log.warning("SE16H: No grid found in results")
-        return []
+    return grid
 
-    # Determine which columns to read
-    read_cols = [f["name"] for f in fields]
-    # Also try to read COUNT column if grouping was used
-    if any(f.get("group") for f in fields):
-        read_cols.append("COUNT")
 
-    return sap.grid_read_all(grid, columns=read_cols, max_rows=max_rows)
+def run_se16h_via_rfc(conn, table: str,
+                      fields: List[Dict[str, str]],
+                      max_rows: int = 0) -> List[Dict[str, str]]:
+    """
+    SE16H-style table read over RFC instead of GUI scripting.
+
+    Uses: RFC_READ_TABLE (QUERY_TABLE, FIELDS, OPTIONS, ROWCOUNT)
+
+    One remote call replaces the whole transaction dialog.  Use it when
+    an RFC connection is available and fall back to run_se16h otherwise.
+
+    Args:
+        conn:     pyrfc.Connection — one per thread, never shared
+        table:    SAP table name
+        fields:   Same field configs as run_se16h; "value" entries become
+                  equality conditions.  "group"/"sum" are not supported
+                  (RFC_READ_TABLE does not aggregate).
+        max_rows: Limit rows returned (0 = all)
+
+    Returns:
+        List of row dicts with field values (trailing blanks removed).
+    """
+    if any(f.get("group") or f.get("sum") for f in fields):
+        raise ValueError("run_se16h_via_rfc: group/sum need run_se16h")
+
+    tokens = []
+    for f in fields:
+        if "value" in f:
+            value = str(f["value"]).replace("'", "''")
+            if len(value) + 2 > 72:
+                raise ValueError(
+                    f"run_se16h_via_rfc: value of {f['name']} does not fit "
+                    "an OPTIONS line (72 characters)"
+                )
+            if tokens:
+                tokens.append("AND")
+            tokens += [f["name"], "=", f"'{value}'"]
+    # OPTIONS lines hold at most 72 characters; break between tokens
+    # (a literal cannot be continued on the next line)
+    options = []
+    for token in tokens:
+        if options and len(options[-1]) + 1 + len(token) <= 72:
+            options[-1] += " " + token
+        else:
+            options.append(token)
+
+    result = conn.call(
+        "RFC_READ_TABLE",
+        QUERY_TABLE=table,
+        FIELDS=[{"FIELDNAME": f["name"]} for f in fields],
+        OPTIONS=[{"TEXT": text} for text in options],
+        ROWCOUNT=max_rows,
+    )
+
+    # Rows come back as fixed-width lines; cut them by field offset
+    layout = [(f["FIELDNAME"], int(f["OFFSET"]), int(f["OFFSET"]) + int(f["LENGTH"]))
+              for f in result["FIELDS"]]
+    data = [{name: row["WA"][start:end].rstrip() for name, start, end in layout}
+            for row in result["DATA"]]
+    log.info(f"RFC_READ_TABLE {table}: {len(data)} rows × {len(layout)} columns")
+    return data
 
 
 def run_transaction_report(sap: SapSession, tcode: str,
                            selection_fields: Dict[str, str] = None,
                            execute_vkey: int = SapSession.VKEY_F8,
                            read_columns: List[str] = None,
-                           max_rows: int = 0) -> List[Dict[str, str]]:
+                           max_rows: int = 0,
+                           lock_ui: bool = False,
+                           columnar: bool = False
+                           ) -> Union[List[Dict[str, str]], Dict[str, List[str]]]:
     """
     Generic: open a transaction, fill selection fields, execute, read grid.
 
@@ -769,19 +1751,51 @@ def run_transaction_report(sap: SapSession, tcode: str,
         execute_vkey:     VKey to execute (default F8)
         read_columns:     Columns to extract (None = all)
         max_rows:         Max rows to return (0 = all)
+        lock_ui:          Lock the session UI for the whole run
+        columnar:         Return {column: [values]} instead of row dicts
     """
+    if lock_ui:
+        with sap.locked():
+            return run_transaction_report(sap, tcode, selection_fields,
+                                          execute_vkey, read_columns, max_rows,
+                                          columnar=columnar)
+
+    grid = _report_execute(sap, tcode, selection_fields, execute_vkey)
+    if grid is None:
+        return {} if columnar else []
+
+    if columnar:
+        return sap.grid_read_all_columnar(grid, columns=read_columns, max_rows=max_rows)
+    return sap.grid_read_all(grid, columns=read_columns, max_rows=max_rows)
+
+
+def run_transaction_report_iter(sap: SapSession, tcode: str,
+                                selection_fields: Dict[str, str] = None,
+                                execute_vkey: int = SapSession.VKEY_F8,
+                                read_columns: List[str] = None,
+                                max_rows: int = 0) -> Iterator[Dict[str, str]]:
+    """
+    Streaming run_transaction_report: yields the result rows one by one.
+
+    Same arguments as run_transaction_report.  The transaction runs when
+    iteration starts; rows are read page by page (see grid_read_iter).
+    Wrap the loop in sap.locked() to lock the UI.
+    """
+    grid = _report_execute(sap, tcode, selection_fields, execute_vkey)
+    if grid is not None:
+        yield from sap.grid_read_iter(grid, read_columns, max_rows)
+
+
+def _report_execute(sap: SapSession, tcode: str,
+                    selection_fields: Optional[Dict[str, str]],
+                    execute_vkey: int):
+    """Run a report transaction up to its result list; returns the grid or None."""
     sap.start_transaction(tcode)
 
     # Fill selection screen
     if selection_fields:
-        for field_name, value in selection_fields.items():
-            try:
-                sap.set_field(field_name, value)
-            except Exception:
-                try:
-                    sap.set_field(field_name, value, "txt")
-                except Exception:
-                    log.warning(f"Could not set field {field_name}")
+        for field_name in sap.set_fields(selection_fields):
+            log.warning(f"Could not set field {field_name}")
 
     # Execute
     sap.send_vkey(execute_vkey)
@@ -793,12 +1807,40 @@ def run_transaction_report(sap: SapSession, tcode: str,
     err = sap.check_statusbar_error()
     if err:
         log.warning(f"{tcode} status: {err}")
-        return []
+        return None
 
-    # Read grid
+    # Result grid
     grid = sap.find_grid()
     if grid is None:
         log.warning(f"{tcode}: No grid found")
-        return []
+    return grid
+
+
+def run_transaction_reports_parallel(pool: SapSessionPool,
+                                     specs: List[Dict[str, Any]]
+                                     ) -> list:
+    """
+    Run several run_transaction_report calls at once over a session pool.
+
+    Even a pool of size=2 pays off for a list of reports: while one
+    session waits for the server, the other executes or reads its grid.
+
+    Args:
+        pool:  SapSessionPool; at most pool.size reports run at a time
+        specs: One dict of run_transaction_report keyword arguments per
+               report, e.g. {"tcode": "FBL1N", "selection_fields": {...}}
+
+    Returns:
+        One result per spec (row dicts, or column lists with
+        "columnar": True), in spec order.
+    """
+    def work(spec):
+        return pool.run(lambda sap: run_transaction_report(sap, **spec))
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, pool.size)) as executor:
+            results = executor.map(work, specs)
+        return list(results)
+    finally:
+        pool.finish()
 
-    return sap.grid_read_all(grid, columns=read_columns, max_rows=max_rows)